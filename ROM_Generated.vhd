@@ -1754,23 +1754,23 @@ begin
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"6CA",
             X"004" when X"6CB",
             X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"6CC",
-            X"020" when X"6CD",
+            X"04F" when X"6CD",
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"6CE",
             X"005" when X"6CF",
             X"0" & TYPE_4 & I_SEND when X"6D0",
             X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"6D1",
-            X"04F" when X"6D2",
+            X"04B" when X"6D2",
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"6D3",
             X"004" when X"6D4",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"6D5",
-            X"04B" when X"6D6",
+            X"0" & TYPE_3 & LD & SRC_MEM & DST_ACC when X"6D5",
+            X"044" when X"6D6",
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"6D7",
-            X"005" when X"6D8",
-            X"0" & TYPE_4 & I_SEND when X"6D9",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_ACC when X"6DA",
-            X"044" when X"6DB",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"6DC",
-            X"008" when X"6DD",
+            X"008" when X"6D8",
+            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"6D9",
+            X"020" when X"6DA",
+            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"6DB",
+            X"005" when X"6DC",
+            X"0" & TYPE_4 & I_SEND when X"6DD",
             X"0" & TYPE_2 & JMP_UNCOND when X"6DE",
             X"880" when X"6DF",
             X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"6E0",
@@ -3552,7 +3552,7 @@ begin
             X"0" & TYPE_2 & JMP_COND when X"DD0",
             X"DD4" when X"DD1",
             X"0" & TYPE_2 & JMP_UNCOND when X"DD2",
-            X"E85" when X"DD3",
+            X"E7C" when X"DD3",
             X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"DD4",
             X"04B" when X"DD5",
             X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"DD6",
@@ -3561,7 +3561,7 @@ begin
             X"0" & TYPE_2 & JMP_COND when X"DD9",
             X"DDD" when X"DDA",
             X"0" & TYPE_2 & JMP_UNCOND when X"DDB",
-            X"E85" when X"DDC",
+            X"E7C" when X"DDC",
             X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"DDD",
             X"001" when X"DDE",
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"DDF",
@@ -3661,304 +3661,112 @@ begin
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E3D",
             X"004" when X"E3E",
             X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E3F",
-            X"020" when X"E40",
+            X"06C" when X"E40",
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E41",
             X"005" when X"E42",
             X"0" & TYPE_4 & I_SEND when X"E43",
             X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E44",
-            X"06C" when X"E45",
+            X"065" when X"E45",
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E46",
             X"004" when X"E47",
             X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E48",
-            X"065" when X"E49",
+            X"064" when X"E49",
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E4A",
             X"005" when X"E4B",
             X"0" & TYPE_4 & I_SEND when X"E4C",
             X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E4D",
-            X"064" when X"E4E",
+            X"05F" when X"E4E",
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E4F",
             X"004" when X"E50",
             X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E51",
-            X"05F" when X"E52",
+            X"073" when X"E52",
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E53",
             X"005" when X"E54",
             X"0" & TYPE_4 & I_SEND when X"E55",
             X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E56",
-            X"073" when X"E57",
+            X"074" when X"E57",
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E58",
             X"004" when X"E59",
             X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E5A",
-            X"074" when X"E5B",
+            X"061" when X"E5B",
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E5C",
             X"005" when X"E5D",
             X"0" & TYPE_4 & I_SEND when X"E5E",
             X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E5F",
-            X"061" when X"E60",
+            X"074" when X"E60",
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E61",
             X"004" when X"E62",
             X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E63",
-            X"074" when X"E64",
+            X"065" when X"E64",
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E65",
             X"005" when X"E66",
             X"0" & TYPE_4 & I_SEND when X"E67",
             X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E68",
-            X"065" when X"E69",
+            X"03A" when X"E69",
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E6A",
             X"004" when X"E6B",
             X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E6C",
-            X"03A" when X"E6D",
+            X"020" when X"E6D",
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E6E",
             X"005" when X"E6F",
             X"0" & TYPE_4 & I_SEND when X"E70",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E71",
-            X"020" when X"E72",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E73",
-            X"004" when X"E74",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_ACC when X"E75",
-            X"04C" when X"E76",
-            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"E77",
-            X"0" & TYPE_1 & ALU_BIN2ASCII when X"E78",
+            X"0" & TYPE_3 & LD & SRC_MEM & DST_ACC when X"E71",
+            X"04C" when X"E72",
+            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"E73",
+            X"0" & TYPE_1 & ALU_BIN2ASCII when X"E74",
+            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E75",
+            X"004" when X"E76",
+            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E77",
+            X"00A" when X"E78",
             X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E79",
             X"005" when X"E7A",
             X"0" & TYPE_4 & I_SEND when X"E7B",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E7C",
-            X"00A" when X"E7D",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E7E",
-            X"004" when X"E7F",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E80",
-            X"020" when X"E81",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E82",
-            X"005" when X"E83",
-            X"0" & TYPE_4 & I_SEND when X"E84",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"E85",
-            X"019" when X"E86",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"E87",
-            X"000" when X"E88",
-            X"0" & TYPE_1 & ALU_ADD when X"E89",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"E8A",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"E8B",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"E8C",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"E8D",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"E8E",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"E8F",
-            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"E90",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"E91",
-            X"001" when X"E92",
-            X"0" & TYPE_1 & ALU_AND when X"E93",
-            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"E94",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"E95",
-            X"000" when X"E96",
-            X"0" & TYPE_1 & ALU_CMPE when X"E97",
-            X"0" & TYPE_2 & JMP_COND when X"E98",
-            X"E9C" when X"E99",
-            X"0" & TYPE_2 & JMP_UNCOND when X"E9A",
-            X"EA0" when X"E9B",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E9C",
-            X"000" when X"E9D",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E9E",
-            X"04B" when X"E9F",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"EA0",
-            X"018" when X"EA1",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"EA2",
-            X"000" when X"EA3",
-            X"0" & TYPE_1 & ALU_ADD when X"EA4",
-            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"EA5",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"EA6",
-            X"001" when X"EA7",
-            X"0" & TYPE_1 & ALU_AND when X"EA8",
-            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"EA9",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"EAA",
-            X"000" when X"EAB",
-            X"0" & TYPE_1 & ALU_CMPE when X"EAC",
-            X"0" & TYPE_2 & JMP_COND when X"EAD",
-            X"EB8" when X"EAE",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"EAF",
-            X"01C" when X"EB0",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"EB1",
-            X"001" when X"EB2",
-            X"0" & TYPE_1 & ALU_OR when X"EB3",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"EB4",
-            X"01C" when X"EB5",
-            X"0" & TYPE_2 & JMP_UNCOND when X"EB6",
-            X"EBF" when X"EB7",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"EB8",
-            X"01C" when X"EB9",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"EBA",
-            X"0FE" when X"EBB",
-            X"0" & TYPE_1 & ALU_AND when X"EBC",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"EBD",
-            X"01C" when X"EBE",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"EBF",
-            X"018" when X"EC0",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"EC1",
-            X"000" when X"EC2",
-            X"0" & TYPE_1 & ALU_ADD when X"EC3",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"EC4",
-            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"EC5",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"EC6",
-            X"001" when X"EC7",
-            X"0" & TYPE_1 & ALU_AND when X"EC8",
-            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"EC9",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"ECA",
-            X"000" when X"ECB",
-            X"0" & TYPE_1 & ALU_CMPE when X"ECC",
-            X"0" & TYPE_2 & JMP_COND when X"ECD",
-            X"ED8" when X"ECE",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"ECF",
-            X"01C" when X"ED0",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"ED1",
-            X"002" when X"ED2",
-            X"0" & TYPE_1 & ALU_OR when X"ED3",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"ED4",
-            X"01C" when X"ED5",
-            X"0" & TYPE_2 & JMP_UNCOND when X"ED6",
-            X"EDF" when X"ED7",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"ED8",
-            X"01C" when X"ED9",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"EDA",
-            X"0FD" when X"EDB",
-            X"0" & TYPE_1 & ALU_AND when X"EDC",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"EDD",
-            X"01C" when X"EDE",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"EDF",
-            X"018" when X"EE0",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"EE1",
-            X"000" when X"EE2",
-            X"0" & TYPE_1 & ALU_ADD when X"EE3",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"EE4",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"EE5",
-            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"EE6",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"EE7",
-            X"001" when X"EE8",
-            X"0" & TYPE_1 & ALU_AND when X"EE9",
-            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"EEA",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"EEB",
-            X"000" when X"EEC",
-            X"0" & TYPE_1 & ALU_CMPE when X"EED",
-            X"0" & TYPE_2 & JMP_COND when X"EEE",
-            X"EF9" when X"EEF",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"EF0",
-            X"01C" when X"EF1",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"EF2",
-            X"004" when X"EF3",
-            X"0" & TYPE_1 & ALU_OR when X"EF4",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"EF5",
-            X"01C" when X"EF6",
-            X"0" & TYPE_2 & JMP_UNCOND when X"EF7",
-            X"F00" when X"EF8",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"EF9",
-            X"01C" when X"EFA",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"EFB",
-            X"0FB" when X"EFC",
-            X"0" & TYPE_1 & ALU_AND when X"EFD",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"EFE",
-            X"01C" when X"EFF",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"F00",
-            X"018" when X"F01",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"F02",
-            X"000" when X"F03",
-            X"0" & TYPE_1 & ALU_ADD when X"F04",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"F05",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"F06",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"F07",
-            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"F08",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"F09",
-            X"001" when X"F0A",
-            X"0" & TYPE_1 & ALU_AND when X"F0B",
-            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"F0C",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"F0D",
-            X"000" when X"F0E",
-            X"0" & TYPE_1 & ALU_CMPE when X"F0F",
-            X"0" & TYPE_2 & JMP_COND when X"F10",
-            X"F1B" when X"F11",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"F12",
-            X"01C" when X"F13",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"F14",
-            X"008" when X"F15",
-            X"0" & TYPE_1 & ALU_OR when X"F16",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"F17",
-            X"01C" when X"F18",
-            X"0" & TYPE_2 & JMP_UNCOND when X"F19",
-            X"F22" when X"F1A",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"F1B",
-            X"01C" when X"F1C",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"F1D",
-            X"0F7" when X"F1E",
-            X"0" & TYPE_1 & ALU_AND when X"F1F",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"F20",
-            X"01C" when X"F21",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"F22",
-            X"018" when X"F23",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"F24",
-            X"000" when X"F25",
-            X"0" & TYPE_1 & ALU_ADD when X"F26",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"F27",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"F28",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"F29",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"F2A",
-            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"F2B",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"F2C",
-            X"001" when X"F2D",
-            X"0" & TYPE_1 & ALU_AND when X"F2E",
-            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"F2F",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"F30",
-            X"000" when X"F31",
-            X"0" & TYPE_1 & ALU_CMPE when X"F32",
-            X"0" & TYPE_2 & JMP_COND when X"F33",
-            X"F3E" when X"F34",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"F35",
-            X"01C" when X"F36",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"F37",
-            X"010" when X"F38",
-            X"0" & TYPE_1 & ALU_OR when X"F39",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"F3A",
-            X"01C" when X"F3B",
-            X"0" & TYPE_2 & JMP_UNCOND when X"F3C",
-            X"F45" when X"F3D",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"F3E",
-            X"01C" when X"F3F",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"F40",
-            X"0EF" when X"F41",
-            X"0" & TYPE_1 & ALU_AND when X"F42",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"F43",
-            X"01C" when X"F44",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"F45",
-            X"018" when X"F46",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"F47",
-            X"000" when X"F48",
-            X"0" & TYPE_1 & ALU_ADD when X"F49",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"F4A",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"F4B",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"F4C",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"F4D",
-            X"0" & TYPE_1 & ALU_SHIFTR when X"F4E",
-            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"F4F",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"F50",
-            X"001" when X"F51",
-            X"0" & TYPE_1 & ALU_AND when X"F52",
-            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"F53",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"F54",
-            X"000" when X"F55",
-            X"0" & TYPE_1 & ALU_CMPE when X"F56",
-            X"0" & TYPE_2 & JMP_COND when X"F57",
-            X"F62" when X"F58",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"F59",
-            X"01C" when X"F5A",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"F5B",
-            X"020" when X"F5C",
-            X"0" & TYPE_1 & ALU_OR when X"F5D",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"F5E",
-            X"01C" when X"F5F",
-            X"0" & TYPE_2 & JMP_UNCOND when X"F60",
-            X"F69" when X"F61",
-            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"F62",
-            X"01C" when X"F63",
-            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"F64",
-            X"0DF" when X"F65",
-            X"0" & TYPE_1 & ALU_AND when X"F66",
-            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"F67",
-            X"01C" when X"F68",
-            X"0" & TYPE_2 & JMP_UNCOND when X"F69",
-            X"958" when X"F6A",
+            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"E7C",
+            X"019" when X"E7D",
+            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"E7E",
+            X"000" when X"E7F",
+            X"0" & TYPE_1 & ALU_ADD when X"E80",
+            X"0" & TYPE_1 & ALU_SHIFTR when X"E81",
+            X"0" & TYPE_1 & ALU_SHIFTR when X"E82",
+            X"0" & TYPE_1 & ALU_SHIFTR when X"E83",
+            X"0" & TYPE_1 & ALU_SHIFTR when X"E84",
+            X"0" & TYPE_1 & ALU_SHIFTR when X"E85",
+            X"0" & TYPE_1 & ALU_SHIFTR when X"E86",
+            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"E87",
+            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"E88",
+            X"001" when X"E89",
+            X"0" & TYPE_1 & ALU_AND when X"E8A",
+            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"E8B",
+            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"E8C",
+            X"000" when X"E8D",
+            X"0" & TYPE_1 & ALU_CMPE when X"E8E",
+            X"0" & TYPE_2 & JMP_COND when X"E8F",
+            X"E93" when X"E90",
+            X"0" & TYPE_2 & JMP_UNCOND when X"E91",
+            X"E97" when X"E92",
+            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_ACC when X"E93",
+            X"000" when X"E94",
+            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E95",
+            X"04B" when X"E96",
+            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"E97",
+            X"01C" when X"E98",
+            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"E99",
+            X"0C0" when X"E9A",
+            X"0" & TYPE_1 & ALU_AND when X"E9B",
+            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"E9C",
+            X"055" when X"E9D",
+            X"0" & TYPE_3 & LD & SRC_MEM & DST_A when X"E9E",
+            X"018" when X"E9F",
+            X"0" & TYPE_3 & LD & SRC_CONSTANT & DST_B when X"EA0",
+            X"03F" when X"EA1",
+            X"0" & TYPE_1 & ALU_AND when X"EA2",
+            X"0" & TYPE_3 & LD & SRC_ACC & DST_A when X"EA3",
+            X"0" & TYPE_3 & LD & SRC_MEM & DST_B when X"EA4",
+            X"055" when X"EA5",
+            X"0" & TYPE_1 & ALU_OR when X"EA6",
+            X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM when X"EA7",
+            X"01C" when X"EA8",
+            X"0" & TYPE_2 & JMP_UNCOND when X"EA9",
+            X"958" when X"EAA",
             X"0" & TYPE_1 & ALU_ADD when others;
 end AUTOMATIC;
\ No newline at end of file
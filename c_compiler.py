@@ -1,11 +1,17 @@
 import sys
 import re
+import os
+import json
+import time
+import compiler as rom_assembler
 
 # ==============================================================================
 # CONFIGURACIÓN
 # ==============================================================================
 INPUT_FILE = 'main.c'
 OUTPUT_FILE = 'PROGRAM.txt'
+MAX_ROM_SIZE = 4096
+RAM_BASE = 0x42
 
 # Mapa de Memoria del Hardware
 SYS_CONSTANTS = {
@@ -54,7 +60,11 @@ HARDWARE_ARRAYS = {
 }
 
 class SmartCCompiler:
-    def __init__(self):
+    def __init__(self, optimize_size=False, os_max_cost=None, os_exclude=()):
+        self.optimize_size = optimize_size
+        self.os_max_cost = os_max_cost
+        self.os_exclude = os_exclude
+        self.os_optimizer = None
         self.code_setup = []
         self.code_loop = []
         self.code_isr = []
@@ -62,10 +72,17 @@ class SmartCCompiler:
         self.vars = {}          
         self.defines = {}
         self.arrays = {} 
-        self.mem_ptr = 0x42 
+        self.mem_ptr = RAM_BASE
         self.label_count = 0
         self.block_stack = []   
+        self.brace_level = 0
         self.context = "GLOBAL" 
+        self.tx_pending = False # TXBUF0 cargado, a la espera de TXBUF1 + SEND
+        self.tx_spans = []      # Tramos impares abiertos: donde quedo pendiente el caracter
+        self.gpio_batch = []    # gpio_write estaticos consecutivos al mismo puerto
+        self.construct = "other" # Construccion a la que se imputan las instrucciones emitidas
+        self.phase_times = {}
+        self.construct_counts = {}
 
         for name, addr in HARDWARE_ARRAYS.items():
             self.arrays[name] = addr
@@ -74,11 +91,20 @@ class SmartCCompiler:
         c = f"\t; {comment}" if comment else ""
         if self.current_buffer is not None:
             self.current_buffer.append(f"\t\t{instr}{c}")
+            if instr: self.construct_counts[self.construct] = self.construct_counts.get(self.construct, 0) + 1
 
     def emit_label(self, label):
         if self.current_buffer is not None:
             self.current_buffer.append(f"{label}")
 
+    def enter_construct(self, kind):
+        prev = self.construct
+        self.construct = kind
+        return prev
+
+    def add_phase_time(self, phase, t0):
+        self.phase_times[phase] = self.phase_times.get(phase, 0.0) + (time.perf_counter() - t0) * 1000
+
     def new_label(self, tag):
         self.label_count += 1
         return f"#{tag}_{self.label_count}"
@@ -191,6 +217,7 @@ class SmartCCompiler:
         if pin_name in SYS_CONSTANTS: pin_num = int(SYS_CONSTANTS[pin_name])
         elif pin_name.isdigit(): pin_num = int(pin_name)
 
+        prev_construct = self.enter_construct("gpio_write_static" if pin_num is not None else "gpio_write_dynamic")
         if pin_num is not None:
             # --- MODO ESTÁTICO (Optimizado) ---
             port_addr = ""
@@ -293,6 +320,83 @@ class SmartCCompiler:
             self.emit(f"LD\t.ACC, [{addr_off}]"); self.emit("LD\t.INDEX, .ACC")
             self.emit(f"LD\t.ACC, [{SYS_CONSTANTS['TMP']}]")
             self.emit(f"WRI\t{GPIO_PORTS['OUT_L']}")
+        self.construct = prev_construct
+
+    # ==========================================================================
+    # GPIO WRITE POR PUERTO (Rafagas estaticas)
+    # ==========================================================================
+    def static_pin(self, pin_name, ports):
+        """(direccion de puerto, bit) de un pin constante, o None si es dinamico."""
+        pin_name = pin_name.strip()
+        while pin_name in self.defines: pin_name = self.defines[pin_name]
+        if pin_name in SYS_CONSTANTS: pin_num = int(SYS_CONSTANTS[pin_name])
+        elif pin_name.isdigit(): pin_num = int(pin_name)
+        else: return None
+        if pin_num < 8:    return GPIO_PORTS[ports[0]], pin_num
+        elif pin_num < 16: return GPIO_PORTS[ports[1]], pin_num - 8
+        else:              return GPIO_PORTS[ports[2]], pin_num - 16
+
+    def static_gpio_write(self, line):
+        match = re.match(r'gpio_write\((.+),(.+)\);?$', line)
+        if not match: return None
+        pin = self.static_pin(match.group(1), ("OUT_L", "OUT_M", "OUT_H"))
+        if pin is None: return None
+        return pin[0], pin[1], match.group(2).strip(), line
+
+    def flush_gpio_batch(self):
+        batch, self.gpio_batch = self.gpio_batch, []
+        if len(batch) == 1:
+            self.compile_gpio_write(batch[0][3])
+            return
+        prev_construct = self.enter_construct("gpio_write_static")
+        port_addr = batch[0][0]
+
+        # La ultima escritura a cada bit es la que cuenta
+        last = {}
+        for _, bit, val_expr, _ in batch: last.pop(bit, None); last[bit] = val_expr
+        clear_mask = set_mask = 0
+        copies = {}     # (puerto de entrada, desplazamiento) -> mascara de origen
+        dynamic = []
+        for bit, val_expr in last.items():
+            clear_mask |= 1 << bit
+            match_read = re.match(r'gpio_read\((.+)\)$', val_expr)
+            src_pin = self.static_pin(match_read.group(1), ("IN_L", "IN_M", "IN_H")) if match_read else None
+            if val_expr in ('1', 'true'): set_mask |= 1 << bit
+            elif val_expr in ('0', 'false'): pass
+            elif src_pin:
+                key = (src_pin[0], bit - src_pin[1])
+                copies[key] = copies.get(key, 0) | (1 << src_pin[1])
+            else: dynamic.append((bit, val_expr))
+
+        self.emit("", comment=f"GPIO Write x{len(batch)}: {port_addr}")
+        self.emit(f"LD\t.A, [{port_addr}]"); self.emit(f"LD\t.B, X{(~clear_mask & 0xFF):02X}"); self.emit("AND")
+        if set_mask: self.emit("LD\t.A, .ACC"); self.emit(f"LD\t.B, X{set_mask:02X}"); self.emit("OR")
+        if not copies and not dynamic:
+            self.emit(f"WR\t{port_addr}")
+            self.construct = prev_construct
+            return
+
+        # Copias directas: (IN & mascara) desplazado a su posicion en el puerto de salida
+        addr_acc = self.get_var_addr("__p_out")
+        self.emit(f"WR\t{addr_acc}")
+        for n, ((in_port, shift), src_mask) in enumerate(copies.items()):
+            self.emit(f"LD\t.A, [{in_port}]"); self.emit(f"LD\t.B, X{src_mask:02X}"); self.emit("AND")
+            for _ in range(abs(shift)): self.emit("SHIFTL" if shift > 0 else "SHIFTR")
+            self.emit("LD\t.A, .ACC"); self.emit(f"LD\t.B, [{addr_acc}]"); self.emit("OR")
+            if not dynamic and n == len(copies) - 1:
+                self.emit(f"WR\t{port_addr}")
+                self.construct = prev_construct
+                return
+            self.emit(f"WR\t{addr_acc}")
+
+        for bit, val_expr in dynamic:
+            self.eval_rhs_to_acc(val_expr)
+            lbl_skip = self.new_label("P_Z")
+            self.emit("LD\t.A, .ACC"); self.emit("LD\t.B, X00"); self.emit("CMPE"); self.emit(f"JMPT\t{lbl_skip}")
+            self.emit(f"LD\t.A, [{addr_acc}]"); self.emit(f"LD\t.B, X{1 << bit:02X}"); self.emit("OR"); self.emit(f"WR\t{addr_acc}")
+            self.emit_label(lbl_skip)
+        self.emit(f"LD\t.ACC, [{addr_acc}]"); self.emit(f"WR\t{port_addr}")
+        self.construct = prev_construct
 
     # ==========================================================================
     # GPIO READ (Híbrido) - CORREGIDO
@@ -308,6 +412,7 @@ class SmartCCompiler:
         if pin_name in SYS_CONSTANTS: pin_num = int(SYS_CONSTANTS[pin_name])
         elif pin_name.isdigit(): pin_num = int(pin_name)
 
+        prev_construct = self.enter_construct("gpio_read_static" if pin_num is not None else "gpio_read_dynamic")
         if pin_num is not None:
             # --- MODO ESTÁTICO ---
             port_addr = ""
@@ -376,6 +481,113 @@ class SmartCCompiler:
             self.emit_label(lbl_shift_end)
             self.emit("LD\t.B, X01")
             self.emit("AND")
+        self.construct = prev_construct
+
+    # ==========================================================================
+    # SERIAL PRINT (Fusionado)
+    # ==========================================================================
+    def is_plain_assignment(self, line):
+        if '=' not in line or line.startswith("if") or line.startswith("while"): return False
+        return not any(io in line for io in ("gpio_", "serial_print", "TXBUF"))
+
+    def emit_tx_item(self, item, txbuf):
+        if item[0] == 'LIT': self.emit(f"LD\t.ACC, X{ord(item[1]):02X}")
+        else: self.eval_rhs_to_acc(item[1]); self.emit("LD\t.A, .ACC"); self.emit("BIN2ASCII")
+        self.emit(f"WR\t{txbuf}")
+
+    def flush_serial(self):
+        # Caracter impar pendiente: solo aqui se rellena con espacio
+        if not self.tx_pending: return
+        prev_construct = self.enter_construct("print")
+        self.emit_tx_item(('LIT', ' '), "TXBUF1")
+        self.emit("SEND")
+        self.tx_pending = False
+        if self.tx_spans: self.tx_spans.pop()
+        self.construct = prev_construct
+
+    def join_serial(self, lbl_end, skip_pending):
+        """Cierra un if: el cuerpo y el salto por falso deben llegar con la misma paridad."""
+        if self.tx_pending and not skip_pending:
+            # Solo el cuerpo deja un caracter pendiente: se rellena antes de la union
+            self.flush_serial()
+        # Los tramos abiertos dentro del cuerpo no existen en el camino por falso
+        while self.tx_spans and self.tx_spans[-1]["depth"] > len(self.block_stack): self.tx_spans.pop()
+        if self.tx_pending == skip_pending:
+            self.emit_label(lbl_end)
+        else:
+            # Solo el camino por falso lo deja: se rellena donde quedo pendiente
+            # (como sin fusion) y se repiten las lineas siguientes en paridad par
+            self.replay_span()
+
+    def replay_span(self):
+        span = self.tx_spans[-1]
+        for outer, n in zip(self.tx_spans, span["outer_lines"]): del outer["lines"][n:]
+        del self.current_buffer[span["pos"]:]
+        self.label_count = span["labels"]
+        self.construct_counts = span["counts"]
+        self.vars, self.arrays, self.defines, self.mem_ptr = span["ram"]
+        self.block_stack = self.block_stack[:span["depth"]]
+        self.brace_level = span["braces"]
+        self.tx_pending = True
+        self.flush_serial()
+        prev_construct = self.construct
+        for line in span["lines"]:
+            self.construct = self.line_construct(line)
+            self.compile_line(line)
+        self.construct = prev_construct
+
+    def compile_serial_print(self, line):
+        content_match = re.search(r'serial_print\((.*)\)', line)
+        if not content_match: return
+        content = content_match.group(1)
+        parts = content.split(',', 1)
+        fmt_str_raw = parts[0].strip().strip('"')
+        args = []
+        if len(parts) > 1: args = [x.strip() for x in parts[1].split(',')]
+        print_queue = []
+        arg_idx = 0
+        k = 0
+        while k < len(fmt_str_raw):
+            if fmt_str_raw[k] == '%' and k+1 < len(fmt_str_raw) and fmt_str_raw[k+1] == 'd':
+                if arg_idx < len(args):
+                    print_queue.append(('VAR', args[arg_idx])); arg_idx += 1
+                k += 2
+            elif fmt_str_raw[k] == '\\' and k+1 < len(fmt_str_raw):
+                next_char = fmt_str_raw[k+1]
+                if next_char == 'n':   print_queue.append(('LIT', '\n')); k += 2
+                elif next_char == 'r': print_queue.append(('LIT', '\r')); k += 2
+                else:                  print_queue.append(('LIT', fmt_str_raw[k])); k += 1
+            else:
+                print_queue.append(('LIT', fmt_str_raw[k])); k += 1
+        self.emit("", comment=f"Print: {fmt_str_raw}")
+
+        # Completar el SEND que dejo a medias el print anterior
+        started_odd = self.tx_pending
+        if self.tx_pending and print_queue:
+            self.emit_tx_item(print_queue.pop(0), "TXBUF1")
+            self.emit("SEND")
+            self.tx_pending = False
+
+        for chunk_i in range(0, len(print_queue) - 1, 2):
+            self.emit_tx_item(print_queue[chunk_i], "TXBUF0")
+            self.emit_tx_item(print_queue[chunk_i+1], "TXBUF1")
+            self.emit("SEND")
+
+        if len(print_queue) % 2:
+            self.emit_tx_item(print_queue[-1], "TXBUF0")
+            self.tx_pending = True
+
+        if started_odd and not self.tx_pending:
+            # Fin del tramo impar (dentro de un if el camino por falso seguiria impar)
+            if self.tx_spans and len(self.block_stack) == self.tx_spans[-1]["depth"]: self.tx_spans.pop()
+        elif self.tx_pending and not started_odd:
+            # Inicio de un tramo impar: si un if acaba con paridades distintas se
+            # rellena aqui y se repiten las lineas grabadas desde este punto
+            self.tx_spans.append({"pos": len(self.current_buffer), "labels": self.label_count,
+                                  "counts": dict(self.construct_counts),
+                                  "ram": (dict(self.vars), dict(self.arrays), dict(self.defines), self.mem_ptr),
+                                  "depth": len(self.block_stack), "braces": self.brace_level, "lines": [],
+                                  "outer_lines": [len(s["lines"]) for s in self.tx_spans]})
 
     def smart_normalize(self, raw_source):
         raw_lines = raw_source.split('\n')
@@ -395,176 +607,183 @@ class SmartCCompiler:
             i += 1
         return normalized_lines
 
-    def compile(self, source):
-        lines = self.smart_normalize(source)
-        brace_level = 0
+    def compile_line(self, line):
+        batch_item = self.static_gpio_write(line)
+        if self.gpio_batch and (batch_item is None or batch_item[0] != self.gpio_batch[0][0]):
+            self.flush_gpio_batch()
 
-        for i, line in enumerate(lines):
-            if line.startswith("#define"):
-                parts = line.split()
-                if len(parts) >= 3: self.defines[parts[1]] = parts[2]
-                continue
+        # El caracter pendiente sobrevive a asignaciones sin E/S y, dentro de la
+        # ISR, entra en los if; su cierre se resuelve en join_serial. Fuera de la
+        # ISR una interrupcion puede pisar TXBUF0, asi que no se arrastra por los if.
+        if_open = re.match(r'if\s*\((.+)\s*(==|>|<)\s*(.+)\)\s*\{', line)
+        if_close = line == "}" and self.block_stack and self.block_stack[-1][0] == 'IF'
+        carry_if = self.context == "ISR" and (if_open or if_close)
+        if "serial_print" not in line and not self.is_plain_assignment(line) and not carry_if:
+            self.flush_serial()
+        for span in self.tx_spans: span["lines"].append(line)
 
-            match_arr_decl = re.match(r'int\s+(\w+)\[(\d+)\];', line)
-            if match_arr_decl:
-                name, size = match_arr_decl.groups()
-                base_addr = f"X{self.mem_ptr:02X}"
-                self.arrays[name] = base_addr
-                self.mem_ptr += int(size)
-                continue
+        if line.startswith("#define"):
+            parts = line.split()
+            if len(parts) >= 3: self.defines[parts[1]] = parts[2]
+            return
 
-            if line.startswith("void setup()"):
-                self.context = "SETUP"; self.current_buffer = self.code_setup
-                self.emit_label("#SETUP")
-                if line.endswith('{'): brace_level += 1
-                continue
-            if line.startswith("void loop()"):
-                self.context = "LOOP"; self.current_buffer = self.code_loop
-                self.emit_label("#LOOP_START")
-                if line.endswith('{'): brace_level += 1
-                continue
-            if line.startswith("void ISR()"):
-                self.context = "ISR"; self.current_buffer = self.code_isr
-                if line.endswith('{'): brace_level += 1
-                continue
+        match_arr_decl = re.match(r'int\s+(\w+)\[(\d+)\];', line)
+        if match_arr_decl:
+            name, size = match_arr_decl.groups()
+            base_addr = f"X{self.mem_ptr:02X}"
+            self.arrays[name] = base_addr
+            self.mem_ptr += int(size)
+            return
 
-            if "gpio_write" in line:
-                self.compile_gpio_write(line)
-                continue
+        if line.startswith("void setup()"):
+            self.context = "SETUP"; self.current_buffer = self.code_setup
+            self.emit_label("#SETUP")
+            if line.endswith('{'): self.brace_level += 1
+            return
+        if line.startswith("void loop()"):
+            self.context = "LOOP"; self.current_buffer = self.code_loop
+            self.emit_label("#LOOP_START")
+            if line.endswith('{'): self.brace_level += 1
+            return
+        if line.startswith("void ISR()"):
+            self.context = "ISR"; self.current_buffer = self.code_isr
+            if line.endswith('{'): self.brace_level += 1
+            return
 
-            match_switch = re.match(r'switch\s*\((.+)\)\s*\{', line)
-            if match_switch:
-                var_switch = match_switch.group(1)
-                l_end = self.new_label("SW_END")
-                self.block_stack.append(['SWITCH', var_switch, l_end, None])
-                brace_level += 1
-                continue
+        if "gpio_write" in line:
+            if batch_item: self.gpio_batch.append(batch_item)
+            else: self.compile_gpio_write(line)
+            return
 
-            match_case = re.match(r'case\s*(.+)\s*:', line)
-            if match_case:
-                val_case = match_case.group(1)
-                sw = None
-                for block in reversed(self.block_stack):
-                    if block[0] == 'SWITCH': sw = block; break
-                if sw:
-                    if sw[3]: self.emit_label(sw[3]) 
-                    l_body, l_next = self.new_label("C_BODY"), self.new_label("C_NEXT")
-                    self.emit(f"LD\t.A, {self.resolve_operand(sw[1])}")
-                    self.emit(f"LD\t.B, {self.resolve_operand(val_case)}")
-                    self.emit("CMPE"); self.emit(f"JMPT\t{l_body}"); self.emit(f"JMP\t{l_next}")
-                    self.emit_label(l_body)
-                    sw[3] = l_next
-                continue
+        match_switch = re.match(r'switch\s*\((.+)\)\s*\{', line)
+        if match_switch:
+            var_switch = match_switch.group(1)
+            l_end = self.new_label("SW_END")
+            self.block_stack.append(['SWITCH', var_switch, l_end, None])
+            self.brace_level += 1
+            return
 
-            if line == "break;":
-                target_label = None
-                for block in reversed(self.block_stack):
-                    if block[0] in ['SWITCH', 'WHILE', 'WHILE_1']: target_label = block[2]; break
-                if target_label: self.emit(f"JMP\t{target_label}")
-                continue
+        match_case = re.match(r'case\s*(.+)\s*:', line)
+        if match_case:
+            val_case = match_case.group(1)
+            sw = None
+            for block in reversed(self.block_stack):
+                if block[0] == 'SWITCH': sw = block; break
+            if sw:
+                if sw[3]: self.emit_label(sw[3]) 
+                l_body, l_next = self.new_label("C_BODY"), self.new_label("C_NEXT")
+                self.emit(f"LD\t.A, {self.resolve_operand(sw[1])}")
+                self.emit(f"LD\t.B, {self.resolve_operand(val_case)}")
+                self.emit("CMPE"); self.emit(f"JMPT\t{l_body}"); self.emit(f"JMP\t{l_next}")
+                self.emit_label(l_body)
+                sw[3] = l_next
+            return
 
-            if line.endswith("{"):
-                brace_level += 1
-                if re.match(r'while\s*\(\s*(1|true)\s*\)\s*\{', line):
-                    l_start = self.new_label("W1_S")
-                    self.emit_label(l_start)
-                    self.block_stack.append(('WHILE_1', l_start, None)) 
-                    continue
-                match_if = re.match(r'if\s*\((.+)\s*(==|>|<)\s*(.+)\)\s*\{', line)
-                if match_if:
-                    op1, cond, op2 = match_if.groups()
-                    l_true, l_end = self.new_label("IF_T"), self.new_label("IF_E")
-                    if "gpio_read" in op1:
-                        self.compile_gpio_read(op1); self.emit("LD\t.A, .ACC")
-                    else: self.emit(f"LD\t.A, {self.resolve_operand(op1)}")
-                    self.emit(f"LD\t.B, {self.resolve_operand(op2)}")
-                    if cond == "==": self.emit("CMPE")
-                    elif cond == ">": self.emit("CMPG")
-                    elif cond == "<": self.emit("CMPL")
-                    self.emit(f"JMPT\t{l_true}"); self.emit(f"JMP\t{l_end}"); self.emit_label(l_true)
-                    self.block_stack.append(('IF', l_end))
-                    continue
-                match_while = re.match(r'while\s*\((.+)\s*(==|>|<)\s*(.+)\)\s*\{', line)
-                if match_while:
-                    op1, cond, op2 = match_while.groups()
-                    l_start, l_body, l_end = self.new_label("W_S"), self.new_label("W_B"), self.new_label("W_E")
-                    self.emit_label(l_start)
-                    self.emit(f"LD\t.A, {self.resolve_operand(op1)}")
-                    self.emit(f"LD\t.B, {self.resolve_operand(op2)}")
-                    if cond == "==": self.emit("CMPE")
-                    elif cond == ">": self.emit("CMPG")
-                    elif cond == "<": self.emit("CMPL")
-                    self.emit(f"JMPT\t{l_body}"); self.emit(f"JMP\t{l_end}"); self.emit_label(l_body)
-                    self.block_stack.append(('WHILE', l_start, l_end))
-                    continue
-                continue
+        if line == "break;":
+            target_label = None
+            for block in reversed(self.block_stack):
+                if block[0] in ['SWITCH', 'WHILE', 'WHILE_1']: target_label = block[2]; break
+            if target_label: self.emit(f"JMP\t{target_label}")
+            return
 
-            if line == "}":
-                brace_level -= 1
-                if self.block_stack:
-                    blk = self.block_stack.pop()
-                    if blk[0] == 'WHILE': 
-                        self.emit(f"JMP\t{blk[1]}"); self.emit_label(blk[2])
-                    elif blk[0] == 'WHILE_1': self.emit(f"JMP\t{blk[1]}")
-                    elif blk[0] == 'IF': self.emit_label(blk[1])
-                    elif blk[0] == 'SWITCH':
-                        if blk[3]: self.emit_label(blk[3])
-                        self.emit_label(blk[2])
-                elif self.context == "LOOP" and brace_level == 0:
-                    self.emit("JMP\t#LOOP_START"); self.context = "GLOBAL"; self.current_buffer = None
-                elif self.context == "ISR" and brace_level == 0:
-                    self.emit("RETI"); self.context = "GLOBAL"; self.current_buffer = None
-                elif self.context == "SETUP" and brace_level == 0:
-                    self.emit("JMP\t#LOOP_START"); self.context = "GLOBAL"; self.current_buffer = None
-                continue
+        if line.endswith("{"):
+            self.brace_level += 1
+            if re.match(r'while\s*\(\s*(1|true)\s*\)\s*\{', line):
+                l_start = self.new_label("W1_S")
+                self.emit_label(l_start)
+                self.block_stack.append(('WHILE_1', l_start, None)) 
+                return
+            match_if = re.match(r'if\s*\((.+)\s*(==|>|<)\s*(.+)\)\s*\{', line)
+            if match_if:
+                op1, cond, op2 = match_if.groups()
+                l_true, l_end = self.new_label("IF_T"), self.new_label("IF_E")
+                if "gpio_read" in op1:
+                    self.compile_gpio_read(op1); self.emit("LD\t.A, .ACC")
+                else: self.emit(f"LD\t.A, {self.resolve_operand(op1)}")
+                self.emit(f"LD\t.B, {self.resolve_operand(op2)}")
+                if cond == "==": self.emit("CMPE")
+                elif cond == ">": self.emit("CMPG")
+                elif cond == "<": self.emit("CMPL")
+                self.emit(f"JMPT\t{l_true}"); self.emit(f"JMP\t{l_end}"); self.emit_label(l_true)
+                self.block_stack.append(('IF', l_end, self.tx_pending))
+                return
+            match_while = re.match(r'while\s*\((.+)\s*(==|>|<)\s*(.+)\)\s*\{', line)
+            if match_while:
+                op1, cond, op2 = match_while.groups()
+                l_start, l_body, l_end = self.new_label("W_S"), self.new_label("W_B"), self.new_label("W_E")
+                self.emit_label(l_start)
+                self.emit(f"LD\t.A, {self.resolve_operand(op1)}")
+                self.emit(f"LD\t.B, {self.resolve_operand(op2)}")
+                if cond == "==": self.emit("CMPE")
+                elif cond == ">": self.emit("CMPG")
+                elif cond == "<": self.emit("CMPL")
+                self.emit(f"JMPT\t{l_body}"); self.emit(f"JMP\t{l_end}"); self.emit_label(l_body)
+                self.block_stack.append(('WHILE', l_start, l_end))
+                return
+            return
 
-            if line.startswith("return;"): 
-                if self.context == "LOOP": self.emit("JMP\t#LOOP_START")
-                if self.context == "ISR": self.emit("RETI")
-                continue
+        if line == "}":
+            self.brace_level -= 1
+            if not self.block_stack: self.tx_spans = []   # Fin de funcion: ningun tramo sigue abierto
+            if self.block_stack:
+                blk = self.block_stack.pop()
+                if blk[0] == 'WHILE': 
+                    self.emit(f"JMP\t{blk[1]}"); self.emit_label(blk[2])
+                elif blk[0] == 'WHILE_1': self.emit(f"JMP\t{blk[1]}")
+                elif blk[0] == 'IF': self.join_serial(blk[1], blk[2])
+                elif blk[0] == 'SWITCH':
+                    if blk[3]: self.emit_label(blk[3])
+                    self.emit_label(blk[2])
+            elif self.context == "LOOP" and self.brace_level == 0:
+                self.emit("JMP\t#LOOP_START"); self.context = "GLOBAL"; self.current_buffer = None
+            elif self.context == "ISR" and self.brace_level == 0:
+                self.emit("RETI"); self.context = "GLOBAL"; self.current_buffer = None
+            elif self.context == "SETUP" and self.brace_level == 0:
+                self.emit("JMP\t#LOOP_START"); self.context = "GLOBAL"; self.current_buffer = None
+            return
 
-            if '=' in line and not line.startswith("if") and not line.startswith("while"):
-                line = line.replace(';', '')
-                dest, expr = line.split('=', 1)
-                dest = dest.strip()
-                if dest.startswith("int "): dest = dest[4:].strip()
-                self.compile_expr(dest, expr)
-                continue
+        if line.startswith("return;"): 
+            if self.context == "LOOP": self.emit("JMP\t#LOOP_START")
+            if self.context == "ISR": self.emit("RETI")
+            return
 
-            if "serial_print" in line:
-                content_match = re.search(r'serial_print\((.*)\)', line)
-                if content_match:
-                    content = content_match.group(1)
-                    parts = content.split(',', 1)
-                    fmt_str_raw = parts[0].strip().strip('"')
-                    args = []
-                    if len(parts) > 1: args = [x.strip() for x in parts[1].split(',')]
-                    print_queue = []
-                    arg_idx = 0
-                    k = 0
-                    while k < len(fmt_str_raw):
-                        if fmt_str_raw[k] == '%' and k+1 < len(fmt_str_raw) and fmt_str_raw[k+1] == 'd':
-                            if arg_idx < len(args):
-                                print_queue.append(('VAR', args[arg_idx])); arg_idx += 1
-                            k += 2
-                        elif fmt_str_raw[k] == '\\' and k+1 < len(fmt_str_raw):
-                            next_char = fmt_str_raw[k+1]
-                            if next_char == 'n':   print_queue.append(('LIT', '\n')); k += 2
-                            elif next_char == 'r': print_queue.append(('LIT', '\r')); k += 2
-                            else:                  print_queue.append(('LIT', fmt_str_raw[k])); k += 1
-                        else:
-                            print_queue.append(('LIT', fmt_str_raw[k])); k += 1
-                    self.emit("", comment=f"Print: {fmt_str_raw}")
-                    for chunk_i in range(0, len(print_queue), 2):
-                        item1 = print_queue[chunk_i]
-                        item2 = print_queue[chunk_i+1] if chunk_i+1 < len(print_queue) else ('LIT', ' ') 
-                        if item1[0] == 'LIT': self.emit(f"LD\t.ACC, X{ord(item1[1]):02X}"); self.emit("WR\tTXBUF0")
-                        else: self.eval_rhs_to_acc(item1[1]); self.emit("LD\t.A, .ACC"); self.emit("BIN2ASCII"); self.emit("WR\tTXBUF0")
-                        if item2[0] == 'LIT': self.emit(f"LD\t.ACC, X{ord(item2[1]):02X}"); self.emit("WR\tTXBUF1")
-                        else: self.eval_rhs_to_acc(item2[1]); self.emit("LD\t.A, .ACC"); self.emit("BIN2ASCII"); self.emit("WR\tTXBUF1")
-                        self.emit("SEND")
-                continue
+        if '=' in line and not line.startswith("if") and not line.startswith("while"):
+            line = line.replace(';', '')
+            dest, expr = line.split('=', 1)
+            dest = dest.strip()
+            if dest.startswith("int "): dest = dest[4:].strip()
+            self.compile_expr(dest, expr)
+            return
+
+        if "serial_print" in line:
+            self.compile_serial_print(line)
+            return
 
+    def line_construct(self, line):
+        if "serial_print" in line: return "print"
+        if re.match(r'(switch|case|default)\b', line): return "switch"
+        if self.is_plain_assignment(line) or line.startswith("int "): return "expr"
+        return "control"
+
+    def compile(self, source):
+        t0 = time.perf_counter()
+        lines = self.smart_normalize(source)
+        self.add_phase_time("normalize", t0)
+        self.brace_level = 0
+
+        for line in lines:
+            context = self.context
+            self.construct = self.line_construct(line)
+            t0 = time.perf_counter()
+            self.compile_line(line)
+            # Las cabeceras void X() abren su contexto: se imputan a el, no a GLOBAL
+            if line.startswith("void "): context = self.context
+            self.add_phase_time(f"codegen_{context.lower()}", t0)
+        self.construct = "other"
+        return self.link()
+
+    def link(self):
+        t0 = time.perf_counter()
         final_asm = []
         final_asm.append("; --- BOOT SECTOR ---")
         final_asm.append("JMP\t#SETUP")
@@ -575,14 +794,523 @@ class SmartCCompiler:
         final_asm.append("; --- MAIN PROGRAM ---")
         final_asm.extend(self.code_setup)
         final_asm.extend(self.code_loop)
+        self.add_phase_time("link", t0)
+        if self.optimize_size:
+            t0 = time.perf_counter()
+            self.os_optimizer = SizeOptimizer(self, self.os_max_cost, self.os_exclude)
+            final_asm = self.os_optimizer.run(final_asm)
+            self.add_phase_time("outline", t0)
+        self.rom_words = sum(AsmItem(l).words for l in final_asm)
         return "\n".join(final_asm)
 
+    def collect_stats(self):
+        stats = {
+            "fases_ms": {k: round(v, 3) for k, v in self.phase_times.items()},
+            "instr_por_construccion": dict(sorted(self.construct_counts.items())),
+            "ram": {"slots_usados": self.mem_ptr - RAM_BASE, "variables": len(self.vars),
+                    "siguiente_libre": f"X{self.mem_ptr:02X}"},
+            "rom": {"palabras": self.rom_words, "max": MAX_ROM_SIZE, "margen": MAX_ROM_SIZE - self.rom_words},
+        }
+        if self.os_optimizer:
+            stats["os"] = {"palabras_antes": self.os_optimizer.words_before,
+                           "palabras_despues": self.os_optimizer.words_after,
+                           "secuencias": self.os_optimizer.report}
+        return stats
+
+# ==============================================================================
+# MODO -Os: OUTLINING DE SECUENCIAS REPETIDAS
+# ==============================================================================
+# La ISA no tiene CALL. Se aplican dos tecnicas sobre el ensamblador final:
+#  1) Salto comun: colas identicas que acaban en JMP/RETI se sustituyen por un
+#     JMP a una unica copia (no hace falta volver).
+#  2) Rutina: secuencias identicas se mueven a una rutina compartida. Cada
+#     llamada guarda su id de retorno en RAM y la rutina vuelve mediante un
+#     arbol de comparaciones (LD .B, id / CMPE / JMPT). La ISR y el programa
+#     principal nunca comparten rutina y usan slots de retorno distintos, para
+#     que una interrupcion no pise el id de retorno del bucle.
+# Cada sitio se identifica por la etiqueta del compilador que lo precede y su
+# desplazamiento en instrucciones (p.ej. IF_T_159+0), calculados antes de
+# optimizar. --os-exclude acepta sitios, etiquetas o rutinas/saltos comunes.
+# El coste se mide en ciclos extra por llamada con el modelo de simulator.py:
+# un ciclo por palabra de ROM leida (las instrucciones con operando cuestan 2).
+PINNED_LABELS = {"#ISR", "#SETUP", "#LOOP_START"}
+ALL_REGS = frozenset({"ACC", "A", "B", "INDEX", "FLAG"})
+CLOBBERED_REGS = frozenset({"ACC", "A", "B", "FLAG"}) # Llamada + arbol de retorno
+OS_MIN_ITEMS = 6
+OS_MAX_ITEMS = 128
+
+def asm_words(parts):
+    mnemonic = parts[0].upper()
+    if mnemonic == 'LD' and len(parts) > 2 and parts[2].upper() == '.ACC': return 1
+    if mnemonic in ('LD', 'LDI', 'WR', 'WRI', 'JMP', 'JMPT'): return 2
+    return 1
+
+def asm_reg_effects(parts):
+    """Registros (leidos, escritos) por una instruccion. Ante la duda se asume lectura."""
+    mnemonic = parts[0].upper()
+    reg = lambda tok: tok.upper().lstrip('.')
+    if mnemonic == 'LD':
+        reads = {"ACC"} if parts[2].upper() == '.ACC' else set()
+        return reads, {reg(parts[1])}
+    if mnemonic == 'LDI': return {"INDEX"}, {reg(parts[1])}
+    if mnemonic == 'WR': return {"ACC"}, set()
+    if mnemonic == 'WRI': return {"ACC", "INDEX"}, set()
+    if mnemonic in ('ADD', 'SUB', 'AND', 'OR', 'XOR'): return {"A", "B"}, {"ACC"}
+    if mnemonic in ('SHIFTL', 'SHIFTR'): return {"ACC"}, {"ACC"}
+    if mnemonic in ('BIN2ASCII', 'ASCII2BIN'): return {"A"}, {"ACC"}
+    if mnemonic in ('CMPE', 'CMPG', 'CMPL'): return {"A", "B"}, {"FLAG"}
+    if mnemonic == 'JMPT': return {"FLAG"}, set()
+    if mnemonic in ('JMP', 'SEND', 'RETI'): return set(), set()
+    return set(ALL_REGS), set()
+
+def asm_cycles(*instrs):
+    return sum(asm_words(i.replace(',', ' ').split()) for i in instrs)
+
+OS_CALL_CYCLES = asm_cycles("LD .ACC, X00", "WR X00", "JMP #F", "LD .A, [X00]")
+OS_CMP_CYCLES = asm_cycles("LD .B, X00", "CMPE", "JMPT #R")
+OS_RET_CYCLES = asm_cycles("JMP #R")
+
+class AsmItem:
+    def __init__(self, text, frozen=False):
+        self.text = text
+        self.frozen = frozen
+        self.anchor = None
+        self.clean = text.split(';')[0].strip()
+        self.parts = self.clean.replace(',', ' ').split()
+        if not self.parts: self.kind = 'NOTE'
+        elif self.clean.startswith('#'): self.kind = 'LABEL'
+        else: self.kind = 'INSTR'
+
+    @property
+    def mnemonic(self):
+        return self.parts[0].upper() if self.kind == 'INSTR' else None
+
+    @property
+    def target(self):
+        return self.parts[1] if self.mnemonic in ('JMP', 'JMPT') else None
+
+    @property
+    def words(self):
+        return asm_words(self.parts) if self.kind == 'INSTR' else 0
+
+class SizeOptimizer:
+    def __init__(self, compiler, max_cost=None, exclude=()):
+        self.compiler = compiler
+        self.max_cost = max_cost
+        self.exclude = {x.strip().lstrip('#') for x in exclude if x.strip()}
+        self.report = []
+        self.routines = []
+        self.ret_addrs = {}
+
+    def run(self, asm_lines):
+        self.items = [AsmItem(l) for l in asm_lines]
+        label, offset = "BOOT", 0
+        for it in self.items:
+            if it.kind == 'LABEL': label, offset = it.clean[1:], 0
+            it.anchor = f"{label}+{offset}"
+            if it.kind == 'INSTR': offset += 1
+        self.words_before = sum(it.words for it in self.items)
+        self.cross_jump()
+        self.outline()
+        for routine in self.routines: self.items.extend(routine)
+        self.words_after = sum(it.words for it in self.items)
+        return [it.text for it in self.items]
+
+    def excluded(self, anchor):
+        return anchor is not None and (anchor in self.exclude or anchor.split('+')[0] in self.exclude)
+
+    def index_labels(self):
+        self.label_pos = {it.clean: i for i, it in enumerate(self.items) if it.kind == 'LABEL'}
+        self.label_refs = {}
+        for i, it in enumerate(self.items):
+            if it.target: self.label_refs.setdefault(it.target, []).append(i)
+
+    def splice(self, replaces, inserts=None):
+        inserts = inserts or {}
+        new_items = []
+        i = 0
+        while i < len(self.items):
+            if i in inserts: new_items.append(inserts[i])
+            if i in replaces:
+                end, stub = replaces[i]
+                new_items.extend(stub)
+                i = end
+                continue
+            new_items.append(self.items[i])
+            i += 1
+        self.items = new_items
+
+    # --------------------------------------------------------------------------
+    # 1) Salto comun (cross-jumping)
+    # --------------------------------------------------------------------------
+    def tail_run(self, t):
+        """Instrucciones sin saltos ni etiquetas que preceden al terminador t (de cerca a lejos)."""
+        run = []
+        j = t - 1
+        while j >= 0:
+            it = self.items[j]
+            if it.kind == 'LABEL' or it.target or it.mnemonic == 'RETI': break
+            if it.kind == 'INSTR': run.append(j)
+            j -= 1
+        return run
+
+    def cross_jump(self):
+        kept = {}       # terminador -> [run]
+        labels = {}     # indice en copia conservada -> etiqueta nueva
+        entries = {}
+        blocked = set() # copias conservadas cuyo salto comun se ha excluido
+        replaces = {}
+        for t, it in enumerate(self.items):
+            if it.mnemonic not in ('JMP', 'RETI'): continue
+            run = self.tail_run(t)
+            best = None
+            for krun in kept.get(it.clean, []):
+                n = 0
+                while n < min(len(run), len(krun)) and self.items[run[n]].clean == self.items[krun[n]].clean: n += 1
+                saved = sum(self.items[j].words for j in run[:n]) + it.words - 2
+                if n and (best is None or saved > best[0]): best = (saved, run[n-1], krun[n-1])
+            if best is not None and best[0] > 0 and best[2] not in labels and best[2] not in blocked:
+                # La etiqueta se reserva aunque se excluya, para no renumerar las siguientes
+                lbl = self.compiler.new_label("XJ")
+                if self.excluded(lbl[1:]): blocked.add(best[2])
+                else:
+                    labels[best[2]] = AsmItem(lbl)
+                    entries[best[2]] = {"tipo": "salto_comun", "etiqueta": lbl, "palabras_ahorradas": 0,
+                                        "sitios": [], "ciclos_extra_por_llamada": []}
+            if best is not None and best[0] > 0 and (best[2] in blocked or self.excluded(self.items[best[1]].anchor)):
+                continue    # queda en linea y no sirve de destino para colas posteriores
+            if best is None or best[0] <= 0:
+                kept.setdefault(it.clean, []).append(run)
+                continue
+            saved, start, k_start = best
+            jump = AsmItem(f"\t\tJMP\t{labels[k_start].clean}")
+            jump.anchor = self.items[start].anchor
+            replaces[start] = (t + 1, [jump])
+            entries[k_start]["palabras_ahorradas"] += saved
+            entries[k_start]["sitios"].append(jump.anchor)
+            entries[k_start]["ciclos_extra_por_llamada"].append(OS_RET_CYCLES)
+        # Solo se insertan las etiquetas que han llegado a recibir algun salto
+        used = [k for k in labels if entries[k]["sitios"]]
+        self.report += [entries[k] for k in used]
+        self.splice(replaces, {k: labels[k] for k in used})
+
+    # --------------------------------------------------------------------------
+    # 2) Rutinas compartidas con retorno emulado
+    # --------------------------------------------------------------------------
+    def tokens(self):
+        toks = []
+        for i, it in enumerate(self.items):
+            if it.frozen or it.mnemonic == 'RETI' or it.clean in PINNED_LABELS: toks.append(('F', i))
+            elif it.kind == 'LABEL': toks.append(('L',))
+            elif it.kind == 'NOTE': toks.append(('N', it.text.strip()))
+            elif it.target:
+                p = self.label_pos.get(it.target)
+                toks.append(('J', it.mnemonic, p - i) if p is not None else ('F', i))
+            else: toks.append(('I', it.clean))
+        return toks
+
+    def dead_after(self, start, regs):
+        """True si ningun camino desde start lee regs antes de reescribirlos."""
+        stack = [(start, frozenset(regs))]
+        seen = set()
+        while stack:
+            idx, live = stack.pop()
+            while idx < len(self.items) and (idx, live) not in seen:
+                seen.add((idx, live))
+                it = self.items[idx]
+                if it.kind != 'INSTR': idx += 1; continue
+                reads, writes = asm_reg_effects(it.parts)
+                if reads & live: return False
+                live = live - writes
+                if not live or it.mnemonic == 'RETI': break
+                if it.target:
+                    if it.target not in self.label_pos: return False
+                    if it.mnemonic == 'JMP': idx = self.label_pos[it.target]; continue
+                    stack.append((self.label_pos[it.target], live))
+                idx += 1
+        return True
+
+    def can_outline(self, s, L):
+        end = s + L
+        if self.items[end - 1].kind != 'INSTR': return False
+        for j in range(s, end):
+            it = self.items[j]
+            if it.target and not s <= self.label_pos[it.target] < end: return False
+            if it.kind == 'LABEL' and any(not s <= r < end for r in self.label_refs.get(it.clean, [])): return False
+        # La llamada pisa ACC: la secuencia debe escribirlo antes de leerlo
+        for j in range(s, end):
+            it = self.items[j]
+            if it.kind != 'INSTR': continue
+            if it.target: return False
+            reads, writes = asm_reg_effects(it.parts)
+            if "ACC" in reads: return False
+            if "ACC" in writes: break
+        return self.dead_after(end, CLOBBERED_REGS)
+
+    @staticmethod
+    def call_cost(k, n):
+        # LD/WR/JMP de la llamada + LD .A + comparaciones hasta el id k (+ JMP final)
+        if k < n - 1: return OS_CALL_CYCLES + OS_CMP_CYCLES * (k + 1)
+        return OS_CALL_CYCLES + OS_CMP_CYCLES * (n - 1) + OS_RET_CYCLES
+
+    def try_outline(self, starts, L):
+        sites = []
+        for s in starts:
+            window = [it.anchor for it in self.items[s:s + L] if it.anchor]
+            if self.excluded(self.items[s].anchor):
+                # Sitio excluido: toda su ventana queda en linea, tambien para ventanas desplazadas
+                self.exclude.update(window)
+                continue
+            if any(self.excluded(a) for a in window): continue
+            if (not sites or s >= sites[-1] + L) and self.can_outline(s, L): sites.append(s)
+        if self.max_cost is not None:
+            while len(sites) >= 2 and self.call_cost(len(sites) - 1, len(sites)) > self.max_cost: sites.pop()
+        n = len(sites)
+        if n < 2: return False
+        size = sum(it.words for it in self.items[sites[0]:sites[0] + L])
+        dispatch = 2 + 5 * (n - 1) + 2
+        saved = n * size - (n * 6 + size + dispatch)
+        if saved <= 0: return False
+
+        region = self.region(sites[0])
+        if region not in self.ret_addrs: self.ret_addrs[region] = self.compiler.get_var_addr(f"__os_ret_{region.lower()}")
+        ret_addr = self.ret_addrs[region]
+        site_ids = [self.items[s].anchor for s in sites]
+        fn = self.compiler.new_label("OS_FN")
+        ret_labels = [self.compiler.new_label("OS_RET") for _ in sites]
+        if self.excluded(fn[1:]):
+            # Rutina excluida: todo su cuerpo queda en linea en cada sitio, y no
+            # se vuelve a agrupar (ni siquiera desplazado o recortado)
+            self.exclude.update(it.anchor for s in sites for it in self.items[s:s + L] if it.anchor)
+            return False
+        routine = [AsmItem(fn, True)]
+        routine += [AsmItem(it.text, True) for it in self.items[sites[0]:sites[0] + L]]
+        routine.append(AsmItem(f"\t\tLD\t.A, [{ret_addr}]", True))
+        for k, lbl in enumerate(ret_labels[:-1]):
+            routine.append(AsmItem(f"\t\tLD\t.B, X{k:02X}", True))
+            routine.append(AsmItem("\t\tCMPE", True))
+            routine.append(AsmItem(f"\t\tJMPT\t{lbl}", True))
+        routine.append(AsmItem(f"\t\tJMP\t{ret_labels[-1]}", True))
+        self.routines.append(routine)
+
+        replaces = {}
+        for k, s in enumerate(sites):
+            replaces[s] = (s + L, [AsmItem(f"\t\tLD\t.ACC, X{k:02X}\t; Os: llamada a {fn}", True),
+                                   AsmItem(f"\t\tWR\t{ret_addr}", True),
+                                   AsmItem(f"\t\tJMP\t{fn}", True),
+                                   AsmItem(ret_labels[k], True)])
+        self.splice(replaces)
+        self.report.append({"tipo": "rutina", "etiqueta": fn, "palabras_rutina": size, "llamadas": n,
+                            "palabras_ahorradas": saved, "sitios": site_ids,
+                            "ciclos_extra_por_llamada": [self.call_cost(k, n) for k in range(n)]})
+        return True
+
+    def region(self, idx):
+        return "ISR" if idx < self.label_pos.get("#SETUP", len(self.items)) else "MAIN"
+
+    def outline(self):
+        for L in range(OS_MAX_ITEMS, OS_MIN_ITEMS - 1, -1):
+            applied = True
+            while applied:
+                applied = False
+                self.index_labels()
+                toks = self.tokens()
+                groups = {}
+                for s in range(len(toks) - L + 1):
+                    groups.setdefault((self.region(s), tuple(toks[s:s + L])), []).append(s)
+                for starts in groups.values():
+                    if len(starts) >= 2 and self.try_outline(starts, L):
+                        applied = True
+                        break
+
+
+# ==============================================================================
+# MODO WATCH: RECOMPILACION INCREMENTAL POR FUNCION
+# ==============================================================================
+# El compilador queda residente. Si solo cambia el cuerpo de setup/loop/ISR se
+# regenera unicamente su buffer, reiniciando el contador de etiquetas en el
+# mismo punto que en la compilacion completa (nombres estables). Cada funcion
+# empieza su numeracion en un multiplo de WATCH_LABEL_SLACK para poder crecer
+# sin invadir la de la siguiente. La RAM tambien se rehace desde el estado que
+# tenia la funcion; si asigna variables/arrays distintos se compila todo. El
+# ensamblador reutiliza la codificacion de las lineas ya vistas y solo resuelve
+# etiquetas.
+FUNCTION_BUFFERS = {"setup": "code_setup", "loop": "code_loop", "ISR": "code_isr"}
+WATCH_POLL_S = 0.1
+WATCH_LABEL_SLACK = 1000
+
+def split_functions(lines):
+    """Separa las lineas normalizadas en globales y [(funcion, lineas)]."""
+    global_lines, functions = [], []
+    current, depth = None, 0
+    for line in lines:
+        if current is None:
+            match_fn = re.match(r'void\s+(\w+)\s*\(\)', line)
+            if not match_fn:
+                global_lines.append(line)
+                continue
+            current, depth = (match_fn.group(1), [line]), line.count('{')
+            continue
+        current[1].append(line)
+        depth += line.count('{') - line.count('}')
+        if depth == 0:
+            functions.append((current[0], tuple(current[1])))
+            current = None
+    if current: functions.append((current[0], tuple(current[1])))
+    return tuple(global_lines), functions
+
+class WatchSession:
+    def __init__(self, optimize_size=False, os_max_cost=None, os_exclude=()):
+        self.optimize_size = optimize_size
+        self.os_max_cost = os_max_cost
+        self.os_exclude = os_exclude
+        self.compiler = None
+        self.layout = None      # (globales, [(funcion, lineas)]) de la ultima compilacion
+        self.label_base = {}    # funcion -> label_count al empezar su cuerpo
+        self.alloc_start = {}   # funcion -> RAM asignada al empezar / acabar su cuerpo
+        self.alloc_end = {}
+        self.alloc_final = None
+        self.encode_cache = {}
+        self.symbol_table = None
+
+    def alloc_state(self):
+        c = self.compiler
+        return dict(c.vars), dict(c.arrays), dict(c.defines), c.mem_ptr
+
+    def restore_alloc(self, state):
+        c = self.compiler
+        c.vars, c.arrays, c.defines = dict(state[0]), dict(state[1]), dict(state[2])
+        c.mem_ptr = state[3]
+
+    def full_build(self, lines):
+        self.compiler = SmartCCompiler(self.optimize_size, self.os_max_cost, self.os_exclude)
+        self.label_base = {}
+        self.alloc_start, self.alloc_end = {}, {}
+        current = None
+        for line in lines:
+            match_fn = re.match(r'void\s+(\w+)\s*\(\)', line)
+            if match_fn:
+                if current: self.alloc_end[current] = self.alloc_state()
+                current = match_fn.group(1)
+                if self.label_base: self.compiler.label_count = -(-self.compiler.label_count // WATCH_LABEL_SLACK) * WATCH_LABEL_SLACK
+                self.label_base[current] = self.compiler.label_count
+                self.alloc_start[current] = self.alloc_state()
+            self.compiler.compile_line(line)
+        if current: self.alloc_end[current] = self.alloc_state()
+        self.alloc_final = self.alloc_state()
+
+    def recompile_function(self, name, body):
+        c = self.compiler
+        setattr(c, FUNCTION_BUFFERS[name], [])
+        c.label_count = self.label_base[name]
+        c.brace_level = 0; c.block_stack = []; c.context = "GLOBAL"; c.current_buffer = None
+        c.tx_pending = False; c.gpio_batch = []; c.tx_spans = []
+        # Se parte de la RAM que tenia la funcion en la compilacion completa; si
+        # asigna variables o arrays distintos, las direcciones de las siguientes
+        # cambiarian y hace falta recompilar todo
+        self.restore_alloc(self.alloc_start[name])
+        for line in body: c.compile_line(line)
+        if self.alloc_state() != self.alloc_end[name]: return False
+        self.restore_alloc(self.alloc_final)
+        # Si la funcion necesita mas etiquetas invadiria la numeracion de la siguiente
+        later = [b for b in self.label_base.values() if b > self.label_base[name]]
+        return not later or c.label_count <= min(later)
+
+    def build(self, source):
+        t0 = time.perf_counter()
+        lines = SmartCCompiler().smart_normalize(source)
+        layout = split_functions(lines)
+        names = [n for n, _ in layout[1]]
+
+        rebuilt = None
+        if (self.layout and not self.optimize_size and layout[0] == self.layout[0]
+                and names == [n for n, _ in self.layout[1]] and all(n in FUNCTION_BUFFERS for n in names)):
+            rebuilt = [n for (n, body), (_, old) in zip(layout[1], self.layout[1]) if body != old]
+            for name, body in layout[1]:
+                if name in rebuilt and not self.recompile_function(name, body):
+                    rebuilt = None
+                    break
+        if rebuilt is None:
+            self.full_build(lines)
+        self.layout = layout
+
+        asm = self.compiler.link()
+        with open(OUTPUT_FILE, 'w') as f: f.write(asm)
+
+        asm_lines = asm.split('\n')
+        label_table, symbol_table, pc = rom_assembler.label_pass(asm_lines)
+        if symbol_table != self.symbol_table:
+            self.encode_cache = {}
+            self.symbol_table = symbol_table
+        cached = len(self.encode_cache)
+        rom_content = rom_assembler.encode_pass(asm_lines, label_table, symbol_table, self.encode_cache)
+        rom_assembler.write_vhdl(rom_content, rom_assembler.OUTPUT_FILE)
+
+        scope = "completa" if rebuilt is None else (", ".join(rebuilt) or "sin cambios")
+        print(f"[WATCH] {scope}: {len(self.encode_cache) - cached} lineas codificadas, "
+              f"{pc}/{rom_assembler.MAX_ROM_SIZE} palabras en {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+def watch(session):
+    print(f"[WATCH] Vigilando '{INPUT_FILE}' (Ctrl+C para salir)")
+    last_mtime = None
+    try:
+        while True:
+            try:
+                mtime = os.stat(INPUT_FILE).st_mtime_ns
+                if mtime != last_mtime:
+                    with open(INPUT_FILE, 'r') as f: src = f.read()
+                    last_mtime = mtime
+                    session.build(src)
+            except FileNotFoundError:
+                pass    # Guardado atomico (borrar + renombrar) a medias: se reintenta en el siguiente sondeo
+            except Exception as e:
+                print(f"[WATCH] Error: {e}")
+                session.layout = None
+            time.sleep(WATCH_POLL_S)
+    except KeyboardInterrupt:
+        print("\n[WATCH] Fin.")
+
 if __name__ == "__main__":
+    # Con --stats sin ruta, stdout queda solo para el JSON; el listado va a stderr
+    stats_arg = next((a for a in sys.argv[1:] if a.startswith("--stats")), None)
+    out = sys.stderr if stats_arg == "--stats" else sys.stdout
+
     try:
         with open(INPUT_FILE, 'r') as f: src = f.read()
-    except: print(f"Error: Crea '{INPUT_FILE}'"); sys.exit(1)
+    except: print(f"Error: Crea '{INPUT_FILE}'", file=out); sys.exit(1)
     
-    asm = SmartCCompiler().compile(src)
-    print(asm)
+    # --os-max-cost=ciclos, --os-exclude=OS_FN_201,IF_T_159+0,...
+    os_max_cost = None
+    os_exclude = []
+    for arg in sys.argv[1:]:
+        if arg.startswith("--os-max-cost="): os_max_cost = int(arg.split('=', 1)[1])
+        if arg.startswith("--os-exclude="): os_exclude = arg.split('=', 1)[1].split(',')
+
+    if "--watch" in sys.argv:
+        watch(WatchSession("-Os" in sys.argv, os_max_cost, os_exclude))
+        sys.exit(0)
+
+    compiler = SmartCCompiler(optimize_size="-Os" in sys.argv, os_max_cost=os_max_cost, os_exclude=os_exclude)
+    asm = compiler.compile(src)
+    print(asm, file=out)
+    t0 = time.perf_counter()
     with open(OUTPUT_FILE, 'w') as f: f.write(asm)
-    print(f"\n[OK] {OUTPUT_FILE} generado.")
\ No newline at end of file
+    compiler.add_phase_time("write", t0)
+    print(f"\n[OK] {OUTPUT_FILE} generado.", file=out)
+
+    opt = compiler.os_optimizer
+    if opt:
+        for entry in opt.report:
+            costs = entry["ciclos_extra_por_llamada"]
+            print(f"[Os] {entry['tipo']} {entry['etiqueta']}: -{entry['palabras_ahorradas']} palabras, "
+                  f"+{min(costs)}..{max(costs)} ciclos/llamada ({len(costs)} sitios)", file=out)
+            for site, cost in zip(entry["sitios"], costs):
+                print(f"[Os]     {site}: +{cost} ciclos", file=out)
+        print(f"[Os] ROM: {opt.words_before} -> {opt.words_after} palabras", file=out)
+
+    # --stats (JSON por stdout) o --stats=ruta.json
+    if stats_arg:
+        stats_json = json.dumps(compiler.collect_stats(), indent=2)
+        if '=' in stats_arg:
+            with open(stats_arg.split('=', 1)[1], 'w') as f: f.write(stats_json)
+        else: print(stats_json)
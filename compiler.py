@@ -1,5 +1,7 @@
 import sys
 import re
+import json
+import time
 
 # ==============================================================================
 # CONFIGURACIÓN
@@ -52,130 +54,139 @@ def to_hex_12bit(value_str):
 
 def parse_line(line): return line.split(';')[0].strip()
 
-label_table = {}
-symbol_table = DEFAULT_SYMBOLS.copy()
-rom_content = []
-
-# ==============================================================================
-# PASADA 1: ETIQUETAS
-# ==============================================================================
-try:
-    with open(INPUT_FILE, 'r') as f: lines = f.readlines()
-except: print(f"Error: Falta {INPUT_FILE}"); sys.exit(1)
-
-pc = 0
-for line in lines:
-    clean = parse_line(line)
-    if not clean: continue
-    if ':' in clean:
-        parts = clean.split(':')
-        symbol_table[parts[0].strip()] = parts[1].strip()
-        continue
-    if clean.startswith('#'):
-        label_table[clean.split()[0][1:]] = pc
-        if len(clean.split()) > 1: clean = " ".join(clean.split()[1:])
-        else: continue
-    
-    parts = clean.replace(',', ' ').split()
+def instruction_words(parts):
     mnemonic = parts[0].upper()
-    
-    if mnemonic in ALU_OPS or mnemonic in SPECIAL_OPS: pc += 1
-    elif mnemonic in ['JMP', 'JMPT']: pc += 2
-    elif mnemonic in ['LD', 'LDI', 'WR', 'WRI']:
-        if mnemonic == 'LD' and len(parts) > 2 and parts[2].upper() == '.ACC': pc += 1
-        else: pc += 2
-
-# ==============================================================================
-# PASADA 2: GENERACIÓN DE CÓDIGO
-# ==============================================================================
-pc = 0
-def resolve(token):
+    if mnemonic in ALU_OPS or mnemonic in SPECIAL_OPS: return 1
+    if mnemonic in ['JMP', 'JMPT']: return 2
+    if mnemonic in ['LD', 'LDI', 'WR', 'WRI']:
+        if mnemonic == 'LD' and len(parts) > 2 and parts[2].upper() == '.ACC': return 1
+        return 2
+    return 0
+
+def resolve(token, symbol_table, label_table):
     res = to_hex_12bit(token)
     if res: return res
     if token in symbol_table: return to_hex_12bit(symbol_table[token])
     if token in label_table: return f'X"{label_table[token]:03X}"'
-    if token.startswith('[') and token.endswith(']'): return resolve(token[1:-1])
+    if token.startswith('[') and token.endswith(']'): return resolve(token[1:-1], symbol_table, label_table)
     return f'ERROR({token})'
 
-for line in lines:
-    clean = parse_line(line)
-    if not clean: continue
-    if ':' in clean: continue
-    if clean.startswith('#'):
-        if len(clean.split()) > 1: clean = " ".join(clean.split()[1:])
-        else: continue
+# ==============================================================================
+# PASADA 1: ETIQUETAS
+# ==============================================================================
+def label_pass(lines):
+    label_table = {}
+    symbol_table = DEFAULT_SYMBOLS.copy()
+    pc = 0
+    for line in lines:
+        clean = parse_line(line)
+        if not clean: continue
+        if ':' in clean:
+            parts = clean.split(':')
+            symbol_table[parts[0].strip()] = parts[1].strip()
+            continue
+        if clean.startswith('#'):
+            label_table[clean.split()[0][1:]] = pc
+            if len(clean.split()) > 1: clean = " ".join(clean.split()[1:])
+            else: continue
+        pc += instruction_words(clean.replace(',', ' ').split())
+    return label_table, symbol_table, pc
 
+# ==============================================================================
+# PASADA 2: GENERACIÓN DE CÓDIGO
+# ==============================================================================
+def encode_line(clean, symbol_table):
+    """Palabras de ROM de una instruccion. Los operandos que dependen de etiquetas
+    quedan como ('REF', token) y se resuelven al colocar la instruccion."""
     parts = clean.replace(',', ' ').split()
     mnemonic = parts[0].upper()
+    words = []
 
-    if pc >= MAX_ROM_SIZE:
-        print(f"ERROR FATAL: El programa excede el tamaño de la ROM ({MAX_ROM_SIZE}).")
-        sys.exit(1)
+    def operand(token):
+        res = resolve(token, symbol_table, {})
+        return ('REF', token) if res.startswith('ERROR') else res
 
     # --- TYPE 1: ALU ---
     if mnemonic in ALU_OPS:
-        rom_content.append((pc, f'X"0" & TYPE_1 & {ALU_OPS[mnemonic]}'))
-        pc += 1
-        
+        words.append(f'X"0" & TYPE_1 & {ALU_OPS[mnemonic]}')
+
     # --- TYPE 2: SALTOS ---
     elif mnemonic in ['JMP', 'JMPT']:
         type_jmp = 'JMP_UNCOND' if mnemonic == 'JMP' else 'JMP_COND'
-        rom_content.append((pc, f'X"0" & TYPE_2 & {type_jmp}'))
-        pc += 1
-        rom_content.append((pc, resolve(parts[1].replace('#', ''))))
-        pc += 1
-        
+        words.append(f'X"0" & TYPE_2 & {type_jmp}')
+        words.append(operand(parts[1].replace('#', '')))
+
     # --- TYPE 3: CARGA/ALMACENAMIENTO ---
     elif mnemonic in ['LD', 'LDI', 'WR', 'WRI']:
         op1 = parts[1]
-        
+
         if mnemonic == 'LD':
             # CORRECCIÓN: El destino está en op1 (parts[1]), no en op2
             dst = REGISTERS.get(op1.upper(), 'DST_UNK')
             op2 = parts[2]
-            
+
             if op2.upper() == '.ACC': # LD DST, .ACC
-                rom_content.append((pc, f'X"0" & TYPE_3 & LD & SRC_ACC & {dst}'))
-                pc += 1
+                words.append(f'X"0" & TYPE_3 & LD & SRC_ACC & {dst}')
             else:
                 # Determinar si es Memoria directa [Xnn] o Constante Xnn
                 src_type = 'SRC_MEM' if op2.startswith('[') else 'SRC_CONSTANT'
-                rom_content.append((pc, f'X"0" & TYPE_3 & LD & {src_type} & {dst}'))
-                pc += 1
-                rom_content.append((pc, resolve(op2)))
-                pc += 1
-                
+                words.append(f'X"0" & TYPE_3 & LD & {src_type} & {dst}')
+                words.append(operand(op2))
+
         elif mnemonic == 'LDI':
             dst = REGISTERS.get(op1.upper(), 'DST_UNK')
             op2 = parts[2] # Origen Indexado
-            rom_content.append((pc, f'X"0" & TYPE_3 & LD & SRC_INDXD_MEM & {dst}'))
-            pc += 1
-            rom_content.append((pc, resolve(op2)))
-            pc += 1
-            
+            words.append(f'X"0" & TYPE_3 & LD & SRC_INDXD_MEM & {dst}')
+            words.append(operand(op2))
+
         elif mnemonic == 'WR':
-            rom_content.append((pc, f'X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM'))
-            pc += 1
-            rom_content.append((pc, resolve(op1)))
-            pc += 1
-            
+            words.append(f'X"0" & TYPE_3 & WR & SRC_ACC & DST_MEM')
+            words.append(operand(op1))
+
         elif mnemonic == 'WRI':
-            rom_content.append((pc, f'X"0" & TYPE_3 & WR & SRC_ACC & DST_INDXD_MEM'))
-            pc += 1
-            rom_content.append((pc, resolve(op1)))
-            pc += 1
+            words.append(f'X"0" & TYPE_3 & WR & SRC_ACC & DST_INDXD_MEM')
+            words.append(operand(op1))
 
     # --- TYPE 4: SPECIAL (SEND, RETI) ---
     elif mnemonic in SPECIAL_OPS:
         vhdl_constant = SPECIAL_OPS[mnemonic]
-        rom_content.append((pc, f'X"0" & TYPE_4 & {vhdl_constant}'))
-        pc += 1
+        words.append(f'X"0" & TYPE_4 & {vhdl_constant}')
+
+    return words
+
+def encode_pass(lines, label_table, symbol_table, cache=None, instr_counts=None):
+    """Genera (pc, palabra) para toda la ROM. `cache` (texto -> palabras) evita
+    recodificar las lineas ya vistas; solo valido para la misma tabla de simbolos."""
+    if cache is None: cache = {}
+    rom_content = []
+    pc = 0
+    for line in lines:
+        clean = parse_line(line)
+        if not clean: continue
+        if ':' in clean: continue
+        if clean.startswith('#'):
+            if len(clean.split()) > 1: clean = " ".join(clean.split()[1:])
+            else: continue
+
+        if pc >= MAX_ROM_SIZE:
+            raise Exception(f"El programa excede el tamaño de la ROM ({MAX_ROM_SIZE}).")
+        if instr_counts is not None:
+            mnemonic = clean.replace(',', ' ').split()[0].upper()
+            instr_counts[mnemonic] = instr_counts.get(mnemonic, 0) + 1
+
+        if clean not in cache: cache[clean] = encode_line(clean, symbol_table)
+        for word in cache[clean]:
+            if not isinstance(word, str): word = resolve(word[1], symbol_table, label_table)
+            rom_content.append((pc, word))
+            pc += 1
+    return rom_content
 
 # ==============================================================================
 # ESCRITURA DEL ARCHIVO VHDL
 # ==============================================================================
-with open(OUTPUT_FILE, 'w') as f:
-    f.write("""LIBRARY IEEE;
+def write_vhdl(rom_content, path):
+    with open(path, 'w') as f:
+        f.write("""LIBRARY IEEE;
 USE IEEE.std_logic_1164.all;
 USE IEEE.numeric_std.all;
 USE work.PIC_pkg.all;
@@ -191,8 +202,46 @@ begin
     with Program_counter select
         Instruction <=
 """)
-    for addr, code in rom_content:
-        f.write(f'            {code} when X"{addr:03X}",\n')
-    f.write('            X"0" & TYPE_1 & ALU_ADD when others;\nend AUTOMATIC;')
-
-print(f"[OK] ROM Generada. Tamaño: {pc}/{MAX_ROM_SIZE} palabras.")
\ No newline at end of file
+        for addr, code in rom_content:
+            f.write(f'            {code} when X"{addr:03X}",\n')
+        f.write('            X"0" & TYPE_1 & ALU_ADD when others;\nend AUTOMATIC;')
+
+if __name__ == "__main__":
+    # Con --stats sin ruta, stdout queda solo para el JSON; los mensajes van a stderr
+    stats_arg = next((a for a in sys.argv[1:] if a.startswith("--stats")), None)
+    out = sys.stderr if stats_arg == "--stats" else sys.stdout
+    phase_times = {}
+    instr_counts = {}
+
+    t0 = time.perf_counter()
+    try:
+        with open(INPUT_FILE, 'r') as f: lines = f.readlines()
+    except: print(f"Error: Falta {INPUT_FILE}", file=out); sys.exit(1)
+    phase_times["read"] = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    label_table, symbol_table, pc = label_pass(lines)
+    phase_times["label_pass"] = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    try: rom_content = encode_pass(lines, label_table, symbol_table, instr_counts=instr_counts)
+    except Exception as e: print(f"ERROR FATAL: {e}", file=out); sys.exit(1)
+    phase_times["encode_pass"] = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    write_vhdl(rom_content, OUTPUT_FILE)
+    phase_times["vhdl_write"] = (time.perf_counter() - t0) * 1000
+
+    print(f"[OK] ROM Generada. Tamaño: {pc}/{MAX_ROM_SIZE} palabras.", file=out)
+
+    # --stats (JSON por stdout) o --stats=ruta.json
+    if stats_arg:
+        stats_json = json.dumps({
+            "fases_ms": {k: round(v, 3) for k, v in phase_times.items()},
+            "instr_por_mnemonico": dict(sorted(instr_counts.items())),
+            "etiquetas": len(label_table),
+            "rom": {"palabras": pc, "max": MAX_ROM_SIZE, "margen": MAX_ROM_SIZE - pc},
+        }, indent=2)
+        if '=' in stats_arg:
+            with open(stats_arg.split('=', 1)[1], 'w') as f: f.write(stats_json)
+        else: print(stats_json)
@@ -0,0 +1,222 @@
+import os
+import sys
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import compiler as rom_assembler
+
+# ==============================================================================
+# CONFIGURACIÓN
+# ==============================================================================
+INPUT_FILE = 'PROGRAM.txt'
+RAM_SIZE = 256
+MAX_STEPS = 20000       # Instrucciones maximas por ejecucion de la ISR
+MAX_TX_BYTES = 96       # Bytes de TXBUF guardados por carril
+ADDR_RCBUF = (0x00, 0x01, 0x02)
+ADDR_TXBUF = (0x04, 0x05)
+
+# Modelo de tiempo: un ciclo por palabra de ROM leida (las instrucciones con
+# operando cuestan 2). Es una estimacion; ajustar si la UC real difiere.
+
+# Semantica de la ALU (8 bits sin signo). Entradas en A/B, resultado en ACC.
+ALU_FUNCS = {
+    'ALU_ADD':       lambda a, b, acc: (a + b) & 0xFF,
+    'ALU_SUB':       lambda a, b, acc: (a - b) & 0xFF,
+    'ALU_SHIFTL':    lambda a, b, acc: (acc << 1) & 0xFF,
+    'ALU_SHIFTR':    lambda a, b, acc: acc >> 1,
+    'ALU_AND':       lambda a, b, acc: a & b,
+    'ALU_OR':        lambda a, b, acc: a | b,
+    'ALU_XOR':       lambda a, b, acc: a ^ b,
+    'ALU_BIN2ASCII': lambda a, b, acc: (a + 0x30) & 0xFF,
+    'ALU_ASCII2BIN': lambda a, b, acc: (a - 0x30) & 0xFF,
+}
+ALU_CMP = {
+    'ALU_CMPE': lambda a, b: a == b,
+    'ALU_CMPG': lambda a, b: a > b,
+    'ALU_CMPL': lambda a, b: a < b,
+}
+DST_REGS = {'DST_A': 'a', 'DST_B': 'b', 'DST_ACC': 'acc', 'DST_INDX': 'index'}
+
+# ==============================================================================
+# DECODIFICACIÓN DE LA ROM
+# ==============================================================================
+def word_value(word):
+    if not word.startswith('X"'): raise Exception(f"Operando no resuelto: {word}")
+    return int(word[2:-1], 16)
+
+def load_rom(path):
+    """Ensambla el programa y decodifica las palabras VHDL en tablas por direccion."""
+    with open(path, 'r') as f: lines = f.readlines()
+    label_table, symbol_table, size = rom_assembler.label_pass(lines)
+    words = [w for _, w in rom_assembler.encode_pass(lines, label_table, symbol_table)]
+
+    forms = []              # instruccion decodificada: tupla de campos VHDL
+    form_ids = {}
+    op = np.zeros(len(words) + 1, dtype=np.int16)
+    operand = np.zeros(len(words) + 1, dtype=np.int32)
+    length = np.ones(len(words) + 1, dtype=np.int32)
+    pc = 0
+    while pc < len(words):
+        fields = tuple(words[pc].split(' & ')[1:])
+        if fields not in form_ids:
+            form_ids[fields] = len(forms)
+            forms.append(fields)
+        op[pc] = form_ids[fields]
+        has_operand = fields[0] == 'TYPE_2' or (fields[0] == 'TYPE_3' and fields[1:3] != ('LD', 'SRC_ACC'))
+        if has_operand:
+            operand[pc] = word_value(words[pc + 1])
+            length[pc] = 2
+        pc += length[pc]
+    # Direccion final: caer fuera de la ROM termina el carril
+    form_ids[('END',)] = len(forms); forms.append(('END',))
+    op[len(words)] = form_ids[('END',)]
+    return {"forms": forms, "op": op, "operand": operand, "length": length, "labels": label_table}
+
+# ==============================================================================
+# MAQUINA MULTICARRIL
+# ==============================================================================
+class LaneMachine:
+    def __init__(self, rom, lanes, ram=None):
+        self.rom = rom
+        self.ram = np.zeros((lanes, RAM_SIZE), dtype=np.uint8) if ram is None else ram
+        self.regs = {r: np.zeros(lanes, dtype=np.int32) for r in ('a', 'b', 'acc', 'index')}
+        self.flag = np.zeros(lanes, dtype=bool)
+        self.pc = np.zeros(lanes, dtype=np.int32)
+        self.done = np.zeros(lanes, dtype=bool)
+        self.cycles = np.zeros(lanes, dtype=np.int32)
+        self.tx = np.zeros((lanes, MAX_TX_BYTES), dtype=np.uint8)
+        self.tx_len = np.zeros(lanes, dtype=np.int32)
+
+    def run(self, stop_pc=None, max_steps=MAX_STEPS):
+        """Ejecuta hasta RETI (o stop_pc) en todos los carriles. Devuelve los que no acabaron."""
+        rom = self.rom
+        for _ in range(max_steps):
+            live = np.nonzero(~self.done)[0]
+            if stop_pc is not None:
+                at_stop = live[self.pc[live] == stop_pc]
+                self.done[at_stop] = True
+                live = live[self.pc[live] != stop_pc]
+            if live.size == 0: break
+            pcs = self.pc[live]
+            ops = rom["op"][pcs]
+            self.cycles[live] += rom["length"][pcs]
+            for form_id in np.unique(ops):
+                sel = live[ops == form_id]
+                self.execute(rom["forms"][form_id], sel, rom["operand"][self.pc[sel]])
+        return np.nonzero(~self.done)[0]
+
+    def execute(self, fields, sel, operand):
+        regs, ram = self.regs, self.ram
+        next_pc = self.pc[sel] + self.rom["length"][self.pc[sel]]
+        kind = fields[0]
+
+        if kind == 'TYPE_1':
+            a, b, acc = regs['a'][sel], regs['b'][sel], regs['acc'][sel]
+            alu = fields[1]
+            if alu in ALU_CMP: self.flag[sel] = ALU_CMP[alu](a, b)
+            elif alu in ALU_FUNCS: regs['acc'][sel] = ALU_FUNCS[alu](a, b, acc)
+            elif alu == 'ALU_MVACC2A': regs['a'][sel] = acc
+            elif alu == 'ALU_MVACC2B': regs['b'][sel] = acc
+            elif alu == 'ALU_MVACC2ID': regs['index'][sel] = acc
+        elif kind == 'TYPE_2':
+            if fields[1] == 'JMP_UNCOND': next_pc = operand
+            else: next_pc = np.where(self.flag[sel], operand, next_pc)
+        elif kind == 'TYPE_3':
+            src, dst = fields[2], fields[3]
+            if fields[1] == 'LD':
+                if src == 'SRC_ACC': value = regs['acc'][sel]
+                elif src == 'SRC_CONSTANT': value = operand & 0xFF
+                elif src == 'SRC_MEM': value = ram[sel, operand % RAM_SIZE]
+                else: value = ram[sel, (operand + regs['index'][sel]) % RAM_SIZE]
+                regs[DST_REGS[dst]][sel] = value
+            else:
+                addr = operand if dst == 'DST_MEM' else operand + regs['index'][sel]
+                ram[sel, addr % RAM_SIZE] = regs['acc'][sel]
+        elif kind == 'TYPE_4':
+            if fields[1] == 'I_RETI':
+                self.done[sel] = True
+            else: # I_SEND
+                pos = self.tx_len[sel]
+                room = pos + 2 <= MAX_TX_BYTES
+                s, p = sel[room], pos[room]
+                self.tx[s, p] = ram[s, ADDR_TXBUF[0]]
+                self.tx[s, p + 1] = ram[s, ADDR_TXBUF[1]]
+                self.tx_len[sel] = pos + 2
+        else: # END
+            self.done[sel] = True
+        self.pc[sel] = next_pc
+
+def boot_state(rom):
+    """RAM tras ejecutar el arranque y setup() hasta entrar en loop()."""
+    machine = LaneMachine(rom, 1)
+    if machine.run(stop_pc=rom["labels"]["LOOP_START"]).size:
+        raise Exception("setup() no llega a #LOOP_START")
+    return machine.ram[0].copy()
+
+# ==============================================================================
+# BARRIDO EXHAUSTIVO DE LA ISR
+# ==============================================================================
+def sweep_command(args):
+    """Todas las combinaciones RCBUF1/RCBUF2 para un valor de RCBUF0."""
+    rom, ram0, cmd = args
+    lanes = 256 * 256
+    ram = np.repeat(ram0[None, :], lanes, axis=0)
+    combos = np.arange(lanes)
+    ram[:, ADDR_RCBUF[0]] = cmd
+    ram[:, ADDR_RCBUF[1]] = combos >> 8
+    ram[:, ADDR_RCBUF[2]] = combos & 0xFF
+
+    machine = LaneMachine(rom, lanes, ram)
+    machine.pc[:] = rom["labels"]["ISR"]
+    timeouts = machine.run().size
+
+    hist = np.bincount(machine.cycles)
+    cycles = {int(c): int(n) for c, n in enumerate(hist) if n}
+    used = min(int(machine.tx_len.max()), MAX_TX_BYTES)
+    traces, counts = np.unique(machine.tx[:, :used], axis=0, return_counts=True)
+    outputs = {}
+    for row, n in zip(traces, counts):
+        text = bytes(row).rstrip(b'\0').decode('latin-1')
+        outputs[text] = outputs.get(text, 0) + int(n)
+    return cmd, {"ciclos": cycles, "salidas": outputs, "sin_terminar": timeouts,
+                 "truncadas": int((machine.tx_len > MAX_TX_BYTES).sum())}
+
+def run_sweep(rom, commands, workers):
+    ram0 = boot_state(rom)
+    tasks = [(rom, ram0, cmd) for cmd in commands]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(sweep_command, tasks))
+
+def cycle_summary(cycles):
+    total = sum(cycles.values())
+    mean = sum(c * n for c, n in cycles.items()) / total
+    return min(cycles), mean, max(cycles)
+
+if __name__ == "__main__":
+    # --commands=IATSR (por defecto los 256 valores de RCBUF0), --workers=N, --json=ruta
+    opts = dict(a[2:].split('=', 1) for a in sys.argv[1:] if a.startswith('--') and '=' in a)
+    commands = [ord(c) for c in opts["commands"]] if "commands" in opts else list(range(256))
+    workers = int(opts.get("workers", os.cpu_count()))
+
+    try: rom = load_rom(INPUT_FILE)
+    except Exception as e: print(f"Error: {e}"); sys.exit(1)
+
+    t0 = time.perf_counter()
+    results = run_sweep(rom, commands, workers)
+    elapsed = time.perf_counter() - t0
+
+    for cmd, res in sorted(results.items()):
+        lo, mean, hi = cycle_summary(res["ciclos"])
+        top = max(res["salidas"].items(), key=lambda kv: kv[1])[0]
+        label = chr(cmd) if 32 < cmd < 127 else f"0x{cmd:02X}"
+        print(f"[SIM] {label}: ciclos {lo}/{mean:.1f}/{hi} (min/media/max), "
+              f"{len(res['salidas'])} salidas distintas, mas comun {top!r}"
+              + (f", {res['sin_terminar']} sin terminar" if res["sin_terminar"] else ""))
+    print(f"[OK] {len(commands) * 65536} ejecuciones de la ISR en {elapsed:.1f} s con {workers} procesos.")
+
+    if "json" in opts:
+        with open(opts["json"], 'w') as f:
+            json.dump({str(cmd): res for cmd, res in sorted(results.items())}, f, indent=2)